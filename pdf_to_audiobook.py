@@ -1,353 +1,938 @@
-#!/usr/bin/env python3
-"""
-PDF to Audiobook Converter - Single-file Tkinter app
-
-Features:
-- Load PDF, extract text using PyMuPDF (fitz)
-- Offline TTS via pyttsx3 (save_to_file) OR online via gTTS
-- Export to MP3, play MP3 inside app (pygame)
-- Controls: speech rate, chunk size, choose page range
-- Simple logging and progress updates
-
-Save this as pdf_to_audiobook.py and run: python pdf_to_audiobook.py
-"""
-
-import os
-import threading
-import tempfile
-import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
-import fitz  # PyMuPDF
-import pyttsx3
-from gtts import gTTS
-import pygame
-import time
-import re
-
-# ---------- Utility functions ----------
-def clean_text(s: str) -> str:
-    # remove multiple newlines and excessive spaces
-    s = re.sub(r'\n\s*\n+', '\n\n', s)
-    s = s.replace('\x0c', '')  # form feed
-    s = s.strip()
-    return s
-
-def extract_text_from_pdf(path, start_page=None, end_page=None, log=None):
-    doc = fitz.open(path)
-    start_page = 0 if start_page is None else max(0, start_page)
-    end_page = doc.page_count - 1 if end_page is None else min(doc.page_count - 1, end_page)
-    all_text = []
-    for i in range(start_page, end_page + 1):
-        page = doc.load_page(i)
-        text = page.get_text().strip()
-        if text:
-            cleaned = clean_text(text)
-            all_text.append((i + 1, cleaned))
-            if log:
-                log(f"Page {i+1}: {len(cleaned)} chars")
-        else:
-            if log:
-                log(f"Page {i+1}: (empty) skipped")
-    doc.close()
-    return all_text
-
-# ---------- TTS handling ----------
-class TTSManager:
-    def __init__(self, engine_name='pyttsx3'):
-        self.engine_name = engine_name
-        if engine_name == 'pyttsx3':
-            self.engine = pyttsx3.init()
-            # collect voices metadata
-            self.voices = self.engine.getProperty('voices')
-        else:
-            self.engine = None
-            self.voices = []
-
-    def get_voice_names(self):
-        if self.engine_name == 'pyttsx3':
-            return [v.name for v in self.voices]
-        return []
-
-    def set_rate(self, rate):
-        if self.engine_name == 'pyttsx3':
-            self.engine.setProperty('rate', rate)
-
-    def set_volume(self, volume):
-        # volume in pyttsx3 is 0.0-1.0
-        if self.engine_name == 'pyttsx3':
-            self.engine.setProperty('volume', max(0.0, min(1.0, volume)))
-
-    def set_voice_by_index(self, idx):
-        if self.engine_name == 'pyttsx3' and 0 <= idx < len(self.voices):
-            self.engine.setProperty('voice', self.voices[idx].id)
-
-    def save_text_to_mp3_pyttsx3(self, text, out_path, log=None):
-        """Use pyttsx3 to save to file. Blocking call (but run in thread outside)."""
-        if self.engine_name != 'pyttsx3':
-            raise RuntimeError("pyttsx3 engine not initialized")
-        if log: log("pyttsx3: starting save_to_file ...")
-        self.engine.save_to_file(text, out_path)
-        self.engine.runAndWait()
-        if log: log(f"Saved (pyttsx3) -> {out_path}")
-
-    def save_text_to_mp3_gtts(self, text, out_path, lang='en', log=None):
-        """Use gTTS to generate mp3. Requires internet."""
-        if log: log("gTTS: generating audio...")
-        tts = gTTS(text=text, lang=lang)
-        tts.save(out_path)
-        if log: log(f"Saved (gTTS) -> {out_path}")
-
-# ---------- Playback ----------
-class Player:
-    def __init__(self, log=None):
-        pygame.mixer.init()
-        self.current = None
-        self.paused = False
-        self.log = log
-
-    def play(self, filepath):
-        if not os.path.isfile(filepath):
-            if self.log: self.log("Play: file not found")
-            return
-        try:
-            pygame.mixer.music.load(filepath)
-            pygame.mixer.music.play()
-            self.current = filepath
-            if self.log: self.log(f"Playing {os.path.basename(filepath)}")
-        except Exception as e:
-            if self.log: self.log(f"Play error: {e}")
-
-    def stop(self):
-        pygame.mixer.music.stop()
-        self.current = None
-        if self.log: self.log("Stopped")
-
-    def pause(self):
-        if not self.paused:
-            pygame.mixer.music.pause()
-            self.paused = True
-            if self.log: self.log("Paused")
-        else:
-            pygame.mixer.music.unpause()
-            self.paused = False
-            if self.log: self.log("Resumed")
-
-# ---------- GUI ----------
-class PDFToAudiobookApp:
-    def __init__(self, root):
-        self.root = root
-        root.title("PDF → Audiobook")
-        root.geometry("820x600")
-        self.pdf_path = None
-        self.extracted = []  # list of (page_no, text)
-        self.tempdir = tempfile.mkdtemp(prefix="pdf_audiobook_")
-        self.player = Player(log=self.log)
-        self.tts_manager = TTSManager('pyttsx3')  # default
-        self.setup_ui()
-
-    def setup_ui(self):
-        frm = ttk.Frame(self.root, padding=8)
-        frm.pack(fill='both', expand=True)
-
-        # Top controls
-        top = ttk.Frame(frm)
-        top.pack(fill='x', pady=4)
-
-        ttk.Button(top, text="Load PDF", command=self.load_pdf).pack(side='left')
-        ttk.Button(top, text="Create Sample PDF", command=self.create_sample_pdf).pack(side='left', padx=6)
-
-        ttk.Label(top, text="TTS Engine:").pack(side='left', padx=(10,2))
-        self.engine_var = tk.StringVar(value='pyttsx3')
-        engine_menu = ttk.Combobox(top, textvariable=self.engine_var, values=['pyttsx3', 'gTTS'], width=8)
-        engine_menu.pack(side='left')
-        engine_menu.bind("<<ComboboxSelected>>", lambda e: self.change_engine())
-
-        ttk.Label(top, text="Rate:").pack(side='left', padx=(10,2))
-        self.rate_var = tk.IntVar(value=160)
-        ttk.Spinbox(top, from_=80, to=300, textvariable=self.rate_var, width=6).pack(side='left')
-
-        ttk.Label(top, text="Chunk size (chars):").pack(side='left', padx=(10,2))
-        self.chunk_var = tk.IntVar(value=3500)
-        ttk.Spinbox(top, from_=1000, to=15000, increment=500, textvariable=self.chunk_var, width=7).pack(side='left')
-
-        # Page range options
-        range_frame = ttk.Frame(frm)
-        range_frame.pack(fill='x', pady=6)
-        ttk.Label(range_frame, text="Pages (start-end, leave blank = all):").pack(side='left')
-        self.pages_entry = ttk.Entry(range_frame, width=20)
-        self.pages_entry.pack(side='left', padx=6)
-
-        # Main area: left list of pages, right controls + log
-        main = ttk.Panedwindow(frm, orient='horizontal')
-        main.pack(fill='both', expand=True)
-
-        left = ttk.Frame(main, width=280)
-        main.add(left, weight=1)
-        right = ttk.Frame(main)
-        main.add(right, weight=3)
-
-        ttk.Label(left, text="Extracted pages").pack(anchor='w')
-        self.pages_list = tk.Listbox(left, height=20)
-        self.pages_list.pack(fill='both', expand=True, padx=4, pady=4)
-
-        # Right controls
-        controls = ttk.Frame(right)
-        controls.pack(fill='x', pady=4)
-        ttk.Button(controls, text="Extract Text", command=self.extract_clicked).pack(side='left')
-        ttk.Button(controls, text="Convert -> MP3", command=self.convert_clicked).pack(side='left', padx=6)
-        ttk.Button(controls, text="Play Selected MP3", command=self.play_selected_mp3).pack(side='left', padx=6)
-        ttk.Button(controls, text="Stop", command=lambda: self.player.stop()).pack(side='left', padx=6)
-        ttk.Button(controls, text="Pause/Resume", command=lambda: self.player.pause()).pack(side='left', padx=6)
-
-        # Log / details
-        ttk.Label(right, text="Log / Output").pack(anchor='w')
-        self.log_text = tk.Text(right, height=20)
-        self.log_text.pack(fill='both', expand=True, padx=4, pady=4)
-
-        # Status bar
-        self.status_var = tk.StringVar(value="Ready")
-        ttk.Label(self.root, textvariable=self.status_var, relief='sunken', anchor='w').pack(side='bottom', fill='x')
-
-    def log(self, msg):
-        ts = time.strftime("%H:%M:%S")
-        self.log_text.insert('end', f"[{ts}] {msg}\n")
-        self.log_text.see('end')
-        self.status_var.set(msg)
-
-    def change_engine(self):
-        eng = self.engine_var.get()
-        self.tts_manager = TTSManager(eng)
-        self.log(f"Switched TTS engine -> {eng}")
-        # update rate/voice options if pyttsx3
-        if eng == 'pyttsx3':
-            voices = self.tts_manager.get_voice_names()
-            self.log(f"Available voices: {voices[:5]}{'...' if len(voices)>5 else ''}")
-
-    def load_pdf(self):
-        path = filedialog.askopenfilename(title="Select PDF", filetypes=[("PDF files","*.pdf")])
-        if not path:
-            return
-        self.pdf_path = path
-        self.log(f"Selected PDF: {path}")
-        self.root.title(f"PDF → Audiobook — {os.path.basename(path)}")
-
-    def create_sample_pdf(self):
-        # create a simple 3-page sample PDF using fitz
-        sample_path = os.path.join(self.tempdir, "sample.pdf")
-        doc = fitz.open()
-        for i in range(1,4):
-            page = doc.new_page()
-            text = f"Sample PDF page {i}\n\nThis is a sample page to demo PDF to audiobook conversion.\n" * 6
-            page.insert_text((72, 72), text, fontsize=12)
-        doc.save(sample_path)
-        doc.close()
-        messagebox.showinfo("Sample PDF created", f"Sample PDF saved to:\n{sample_path}")
-        self.log(f"Sample PDF created: {sample_path}")
-
-    def extract_clicked(self):
-        if not self.pdf_path:
-            messagebox.showwarning("No PDF", "Please load a PDF first.")
-            return
-        # parse page range
-        pr = self.pages_entry.get().strip()
-        start_page = None
-        end_page = None
-        if pr:
-            try:
-                parts = pr.split('-')
-                if len(parts) == 2:
-                    start_page = int(parts[0]) - 1
-                    end_page = int(parts[1]) - 1
-                else:
-                    start_page = int(parts[0]) - 1
-                    end_page = start_page
-            except Exception as e:
-                messagebox.showerror("Invalid range", "Enter pages like '1-5' or '3'")
-                return
-        # extract in background thread
-        def job():
-            try:
-                self.pages_list.delete(0, 'end')
-                self.extracted = extract_text_from_pdf(self.pdf_path, start_page, end_page, log=self.log)
-                for p, text in self.extracted:
-                    preview = text[:120].replace('\n',' ')
-                    self.pages_list.insert('end', f"Page {p}: {preview}...")
-                self.log(f"Extraction complete — {len(self.extracted)} pages")
-            except Exception as e:
-                self.log(f"Extraction error: {e}")
-        threading.Thread(target=job, daemon=True).start()
-
-    def convert_clicked(self):
-        if not self.extracted:
-            messagebox.showwarning("No text", "No extracted text. Click 'Extract Text' first.")
-            return
-        engine = self.engine_var.get()
-        rate = self.rate_var.get()
-        chunk_size = self.chunk_var.get()
-
-        # choose output path
-        outdir = filedialog.askdirectory(title="Choose folder to save MP3(s)")
-        if not outdir:
-            return
-
-        def job():
-            self.log("Starting conversion...")
-            if engine == 'pyttsx3':
-                # configure manager
-                self.tts_manager.set_rate(rate)
-                # volume handled by engine if desired; leave default
-            # For each page create one MP3 (or chunk them as desired)
-            for page_no, text in self.extracted:
-                # split into chunks if too big
-                chunks = []
-                if len(text) <= chunk_size:
-                    chunks = [text]
-                else:
-                    # naive chunking by sentences / words
-                    start = 0
-                    while start < len(text):
-                        end = min(start + chunk_size, len(text))
-                        # try not to cut in the middle of a word
-                        if end < len(text):
-                            next_space = text.rfind(' ', start, end)
-                            if next_space > start:
-                                end = next_space
-                        chunks.append(text[start:end])
-                        start = end
-                # combine chunks to one file per page
-                out_path = os.path.join(outdir, f"page_{page_no}.mp3")
-                try:
-                    if engine == 'pyttsx3':
-                        # pyttsx3 supports saving full text to mp3 (blocking)
-                        full_text = "\n\n".join(chunks)
-                        self.log(f"Saving page {page_no} via pyttsx3 -> {out_path}")
-                        self.tts_manager.save_text_to_mp3_pyttsx3(full_text, out_path, log=self.log)
-                    else:
-                        # gTTS: must create single mp3 per page by concatenating chunks
-                        # We'll generate chunks and append (gTTS only creates files; simple approach: stitch using pygame mixer by playing sequentially)
-                        # But to produce a single mp3 file we save chunk mp3s and then combine bytes (naive). Instead we save a single gTTS file per page (by joining chunks with spaces).
-                        combined = " ".join(chunks)
-                        self.log(f"Saving page {page_no} via gTTS -> {out_path}")
-                        self.tts_manager.save_text_to_mp3_gtts(combined, out_path, log=self.log)
-                    self.log(f"Page {page_no} exported: {out_path}")
-                except Exception as e:
-                    self.log(f"Error saving page {page_no}: {e}")
-            self.log("Conversion finished.")
-            messagebox.showinfo("Done", f"Exported MP3 files to:\n{outdir}")
-
-        threading.Thread(target=job, daemon=True).start()
-
-    def play_selected_mp3(self):
-        path = filedialog.askopenfilename(title="Select MP3 to play", filetypes=[("MP3 files","*.mp3")])
-        if not path:
-            return
-        self.player.play(path)
-
-# ---------- Run ----------
-def main():
-    root = tk.Tk()
-    app = PDFToAudiobookApp(root)
-    root.mainloop()
-
-if __name__ == '__main__':
-    main()
+#!/usr/bin/env python3
+"""
+PDF to Audiobook Converter - Single-file Tkinter app
+
+Features:
+- Load PDF, extract text using PyMuPDF (fitz)
+- Offline TTS via pyttsx3 (save_to_file) OR online via gTTS
+- Export to MP3, play MP3 inside app (pygame)
+- Controls: speech rate, chunk size, choose page range
+- Simple logging and progress updates
+
+Save this as pdf_to_audiobook.py and run: python pdf_to_audiobook.py
+"""
+
+import os
+import threading
+import tempfile
+import concurrent.futures
+import hashlib
+import io
+import json
+import pickle
+import queue
+import shutil
+import subprocess
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+import fitz  # PyMuPDF
+import time
+import re
+from bisect import bisect_left
+from collections import deque
+
+# ---------- Utility functions ----------
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.pdf_audiobook', 'cache')
+CONFIG_PATH = os.path.join(os.path.expanduser('~'), '.pdf_audiobook', 'config.json')
+# voice model for the optional piper engine (the 'piper' binary must be on PATH)
+PIPER_MODEL = os.environ.get('PIPER_MODEL', 'en_US-lessac-medium')
+
+def file_md5(path):
+    return hashlib.md5(open(path, 'rb').read()).hexdigest()
+
+def concat_mp3(part_paths, out_path):
+    """Concatenate MP3 files by appending their bytes.
+
+    MP3 frames are independently decodable and gTTS emits CBR output,
+    so a naive byte-level append produces a playable single file
+    without any transcoding dependency.
+    """
+    with open(out_path, 'wb') as out:
+        for part in part_paths:
+            with open(part, 'rb') as f:
+                shutil.copyfileobj(f, out)
+
+
+# sentence boundary: punctuation followed by whitespace and a capital/quote
+_SENT_RE = re.compile(r'(?<=[.!?])\s+(?=[A-Z"\'])')
+
+def _iter_chunks(text, chunk_size):
+    """Yield TTS-sized chunks of text, split on sentence boundaries.
+
+    Sentences are packed greedily up to chunk_size so chunks end on
+    . ! ? instead of mid-sentence; a sentence longer than chunk_size
+    falls back to splitting at the nearest space. A generator, so each
+    chunk can be handed to the synthesizer as soon as it's packed
+    without materializing the whole page twice.
+    """
+    buf = []
+    buf_len = 0
+    for sent in _SENT_RE.split(text):
+        if not sent:
+            continue
+        if buf and buf_len + 1 + len(sent) > chunk_size:
+            yield ' '.join(buf)
+            buf = []
+            buf_len = 0
+        if len(sent) > chunk_size:
+            # oversized sentence: fall back to word-boundary slicing.
+            # index the spaces once so each boundary is an O(log k)
+            # bisect instead of an O(chunk_size) rfind rescan
+            spaces = [i for i, c in enumerate(sent) if c == ' ']
+            start = 0
+            while start < len(sent):
+                end = min(start + chunk_size, len(sent))
+                if end < len(sent) and spaces:
+                    k = bisect_left(spaces, end) - 1  # nearest space before end
+                    if k >= 0 and spaces[k] > start:
+                        end = spaces[k]
+                yield sent[start:end]
+                start = end
+        else:
+            buf.append(sent)
+            buf_len += len(sent) + 1
+    if buf:
+        yield ' '.join(buf)
+
+# compiled once at import: one fused alternation handles both form feeds
+# (dropped) and blank-line runs (collapsed), so cleaning is a single pass
+_CLEAN_RE = re.compile(r'\x0c|\n\s*\n+')
+
+def _clean_repl(m):
+    return '' if m.group(0) == '\x0c' else '\n\n'
+# newlines -> spaces for the one-line Listbox preview
+_PREVIEW_TABLE = str.maketrans('\n', ' ')
+_PREVIEW_LEN = 120
+
+def _page_entry(page_no, cleaned):
+    """Build the (page_no, text, preview) tuple used across the app.
+    The preview is computed here, once, so the GUI never re-slices
+    megabyte-sized page strings."""
+    return (page_no, cleaned, cleaned[:_PREVIEW_LEN].translate(_PREVIEW_TABLE))
+
+def clean_text(s: str) -> str:
+    # single regex pass over the page instead of translate + sub
+    return _CLEAN_RE.sub(_clean_repl, s).strip()
+
+# text-only extraction: no image blocks, and dehyphenate at the source so
+# TTS doesn't read a line-broken "inter- esting" as two words
+_TEXT_FLAGS = (fitz.TEXTFLAGS_TEXT | fitz.TEXT_DEHYPHENATE) & ~fitz.TEXT_PRESERVE_IMAGES
+
+# below this many pages, process startup costs more than it saves
+_MP_MIN_PAGES = 64
+# summarize extraction progress every N pages instead of logging each one
+_LOG_EVERY = 16
+
+def _extract_range(path, lo, hi):
+    """Extract and clean pages lo..hi (0-based, inclusive).
+
+    Runs in a worker process, so it opens its own Document — fitz
+    objects aren't picklable and can't be shared across processes.
+    """
+    doc = fitz.open(path)
+    out = []
+    for page in doc:
+        n = page.number
+        if n < lo:
+            continue
+        if n > hi:
+            break
+        raw = page.get_text("text", flags=_TEXT_FLAGS, sort=True)
+        # blank pages: skip before paying for the clean_text regex
+        if not raw or raw.isspace():
+            continue
+        cleaned = clean_text(raw)
+        if cleaned:
+            out.append(_page_entry(n + 1, cleaned))
+    doc.close()
+    return out
+
+def extract_text_from_pdf(path, start_page=None, end_page=None, log=None):
+    doc = fitz.open(path)
+    start_page = 0 if start_page is None else max(0, start_page)
+    end_page = doc.page_count - 1 if end_page is None else min(doc.page_count - 1, end_page)
+    n_pages = end_page - start_page + 1
+    if n_pages >= _MP_MIN_PAGES:
+        # big PDF: fan page ranges out to worker processes so the regex
+        # clean pass runs on all cores instead of fighting the GIL
+        doc.close()
+        workers = min(os.cpu_count() or 1, n_pages)
+        if log:
+            log(f"Extracting {n_pages} pages across {workers} processes...")
+        step = -(-n_pages // workers)  # ceil division
+        # drop degenerate lo > hi slices (ceil overshoot on the last
+        # workers), which would otherwise walk the whole page tree for
+        # nothing in their own process
+        ranges = [(lo, min(lo + step - 1, end_page))
+                  for lo in range(start_page, end_page + 1, step)]
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(_extract_range, [path] * len(ranges),
+                               [lo for lo, _ in ranges], [hi for _, hi in ranges])
+        all_text = [item for chunk in results for item in chunk]
+        all_text.sort(key=lambda pt: pt[0])
+        if log:
+            log(f"Extracted {len(all_text)} non-empty pages")
+        return all_text
+    # preallocate one slot per page in range and assign by index; empty
+    # pages stay None and are filtered once at the end
+    all_text = [None] * n_pages
+    # batched logging: one summary per _LOG_EVERY pages rather than a log
+    # line (and a Tk queue entry) for every single page
+    batch_chars = 0
+    batch_start = start_page + 1
+    # iterate the document directly instead of load_page(i) per index;
+    # breaking early skips the page-tree lookup for pages past the range
+    for page in doc:
+        n = page.number
+        if n < start_page:
+            continue
+        if n > end_page:
+            break
+        # sort=True makes MuPDF emit text in reading order
+        raw = page.get_text("text", flags=_TEXT_FLAGS, sort=True)
+        # blank pages: skip before paying for the clean_text regex
+        if raw and not raw.isspace():
+            cleaned = clean_text(raw)
+            all_text[n - start_page] = _page_entry(n + 1, cleaned)
+            batch_chars += len(cleaned)
+        if log and (n - start_page + 1) % _LOG_EVERY == 0:
+            log(f"Pages {batch_start}-{n+1}: {batch_chars} chars")
+            batch_start = n + 2
+            batch_chars = 0
+    if log and batch_start <= end_page + 1:
+        log(f"Pages {batch_start}-{end_page+1}: {batch_chars} chars")
+    doc.close()
+    return [entry for entry in all_text if entry is not None]
+
+# ---------- TTS handling ----------
+class TTSManager:
+    # engines cached per process: pyttsx3.init() is a heavy COM/SAPI or
+    # espeak handshake we only want to pay once, not on every toggle
+    _engines = {}
+
+    def __init__(self, engine_name='pyttsx3'):
+        self.engine_name = engine_name
+
+    @property
+    def engine(self):
+        if self.engine_name != 'pyttsx3':
+            return None
+        if 'pyttsx3' not in TTSManager._engines:
+            import pyttsx3  # deferred: COM/espeak init is heavy
+            TTSManager._engines['pyttsx3'] = pyttsx3.init()
+        return TTSManager._engines['pyttsx3']
+
+    @property
+    def voices(self):
+        if self.engine_name == 'pyttsx3':
+            return self.engine.getProperty('voices')
+        return []
+
+    def get_voice_names(self):
+        if self.engine_name == 'pyttsx3':
+            return [v.name for v in self.voices]
+        return []
+
+    def set_rate(self, rate):
+        if self.engine_name == 'pyttsx3':
+            self.engine.setProperty('rate', rate)
+
+    def set_volume(self, volume):
+        # volume in pyttsx3 is 0.0-1.0
+        if self.engine_name == 'pyttsx3':
+            self.engine.setProperty('volume', max(0.0, min(1.0, volume)))
+
+    def set_voice_by_index(self, idx):
+        if self.engine_name == 'pyttsx3' and 0 <= idx < len(self.voices):
+            self.engine.setProperty('voice', self.voices[idx].id)
+
+    def current_voice_id(self):
+        """Stable identifier of the active voice, for cache keys."""
+        if self.engine_name == 'pyttsx3':
+            return str(self.engine.getProperty('voice'))
+        if self.engine_name == 'piper':
+            return PIPER_MODEL
+        return 'default'
+
+    def save_text_to_mp3_pyttsx3(self, text, out_path, log=None):
+        """Use pyttsx3 to save to file. Blocking call (but run in thread outside)."""
+        if self.engine_name != 'pyttsx3':
+            raise RuntimeError("pyttsx3 engine not initialized")
+        if log: log("pyttsx3: starting save_to_file ...")
+        self.engine.save_to_file(text, out_path)
+        # runAndWait() blocks until the queue is drained; no stop() needed
+        self.engine.runAndWait()
+        if log: log(f"Saved (pyttsx3) -> {out_path}")
+
+    def save_many_pyttsx3(self, items, log=None):
+        """Queue several (text, out_path) saves and drain them with a
+        single runAndWait(), amortizing driver warm-up across all pages."""
+        if self.engine_name != 'pyttsx3':
+            raise RuntimeError("pyttsx3 engine not initialized")
+        if log: log(f"pyttsx3: queueing {len(items)} file(s) ...")
+        for text, out_path in items:
+            self.engine.save_to_file(text, out_path)
+        self.engine.runAndWait()
+        if log: log(f"Saved (pyttsx3) {len(items)} file(s)")
+
+    def save_text_to_mp3_gtts(self, text, out_path, lang='en', log=None):
+        """Use gTTS to generate mp3. Requires internet."""
+        from gtts import gTTS
+        if log: log("gTTS: generating audio...")
+        tts = gTTS(text=text, lang=lang)
+        tts.save(out_path)
+        if log: log(f"Saved (gTTS) -> {out_path}")
+
+    def save_text_to_mp3_piper(self, text, out_path, log=None):
+        """Use the piper CLI (local neural TTS). Requires the 'piper'
+        binary and a downloaded voice model.
+
+        Each call is its own native process that never holds the GIL, so
+        several pages can synthesize truly in parallel. Piper writes WAV
+        data into out_path; the players decode by content, not extension.
+        """
+        if log: log("piper: synthesizing...")
+        proc = subprocess.run(
+            ['piper', '--model', PIPER_MODEL, '--output_file', out_path],
+            input=text.encode('utf-8'),
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        if proc.returncode != 0:
+            raise RuntimeError(f"piper failed: {proc.stderr.decode(errors='replace').strip()}")
+        if log: log(f"Saved (piper) -> {out_path}")
+
+    def synth_gtts_stream(self, text, lang='en', log=None):
+        """Stream gTTS audio into memory; returns a rewound BytesIO.
+
+        Network chunks are appended as they arrive and nothing touches
+        the disk, so playback can start as soon as the buffer is ready
+        instead of waiting for a full file flush. The save() path above
+        remains the one used for export.
+        """
+        from gtts import gTTS
+        if log: log("gTTS: streaming audio...")
+        tts = gTTS(text=text, lang=lang)
+        buf = io.BytesIO()
+        for chunk in tts.stream():
+            buf.write(chunk)
+        buf.seek(0)
+        return buf
+
+# ---------- Playback ----------
+class Player:
+    """MP3 playback, branching on backend like TTSManager does on engine.
+
+    Prefers miniaudio when installed: a tiny native decoder + playback
+    device instead of pygame's full SDL mixer (faster init, smaller RSS,
+    and pause that truly halts the device). Falls back to pygame.
+    """
+    def __init__(self, log=None):
+        self.current = None
+        self.paused = False
+        self.log = log
+        try:
+            import miniaudio
+            self._ma = miniaudio
+            self.backend = 'miniaudio'
+            self._device = None
+            self._stream = None
+            self._finished = threading.Event()
+            self._finished.set()
+        except ImportError:
+            # lazy import: pygame's SDL probe is only paid when it's
+            # actually going to do the playing
+            import pygame
+            self._ma = None
+            self._pg = pygame
+            self.backend = 'pygame'
+            pygame.mixer.init()
+
+    # -- miniaudio internals --
+    def _track_eof(self, stream):
+        """Forward frames to the device and flag EOF on exhaustion."""
+        required = yield b""
+        try:
+            while True:
+                required = yield stream.send(required)
+        except StopIteration:
+            self._finished.set()
+
+    def _ma_start(self, stream, name):
+        self._ma_stop()
+        self._finished.clear()
+        wrapped = self._track_eof(stream)
+        next(wrapped)  # prime to the first yield
+        self._stream = wrapped
+        self._device = self._ma.PlaybackDevice()
+        self._device.start(wrapped)
+        self.current = name
+        self.paused = False
+        if self.log: self.log(f"Playing {name}")
+
+    def _ma_stop(self):
+        if self._device is not None:
+            self._device.close()
+            self._device = None
+        self._stream = None
+        self._finished.set()
+
+    def play(self, filepath):
+        if not os.path.isfile(filepath):
+            if self.log: self.log("Play: file not found")
+            return
+        try:
+            if self.backend == 'miniaudio':
+                self._ma_start(self._ma.stream_file(filepath), os.path.basename(filepath))
+            else:
+                self._pg.mixer.music.load(filepath)
+                self._pg.mixer.music.play()
+                self.current = filepath
+                if self.log: self.log(f"Playing {os.path.basename(filepath)}")
+        except Exception as e:
+            if self.log: self.log(f"Play error: {e}")
+
+    def play_fileobj(self, fileobj, name="stream"):
+        """Play from an in-memory buffer."""
+        try:
+            if self.backend == 'miniaudio':
+                self._ma_start(self._ma.stream_memory(fileobj.read()), name)
+            else:
+                self._pg.mixer.music.load(fileobj)
+                self._pg.mixer.music.play()
+                self.current = name
+                if self.log: self.log(f"Playing {name}")
+        except Exception as e:
+            if self.log: self.log(f"Play error: {e}")
+
+    def stop(self):
+        if self.backend == 'miniaudio':
+            self._ma_stop()
+        else:
+            self._pg.mixer.music.stop()
+        self.current = None
+        self.paused = False
+        if self.log: self.log("Stopped")
+
+    def pause(self):
+        if not self.paused:
+            if self.backend == 'miniaudio':
+                # stopping the device halts pulls from the stream; the
+                # generator keeps its position, so restart resumes exactly
+                if self._device is not None:
+                    self._device.stop()
+            else:
+                self._pg.mixer.music.pause()
+            self.paused = True
+            if self.log: self.log("Paused")
+        else:
+            if self.backend == 'miniaudio':
+                if self._device is not None and self._stream is not None:
+                    self._device.start(self._stream)
+            else:
+                self._pg.mixer.music.unpause()
+            self.paused = False
+            if self.log: self.log("Resumed")
+
+    def is_busy(self):
+        if self.backend == 'miniaudio':
+            return self._device is not None and not self._finished.is_set()
+        return bool(self._pg.mixer.music.get_busy())
+
+class PlaylistPlayer:
+    """Gapless multi-page playback: while page N plays, page N+1 is
+    pre-synthesized by a single background worker, so the synth latency
+    hides behind the (much longer) playback time of the previous page."""
+    def __init__(self, root, player, synthesize, log=None):
+        self.root = root
+        self.player = player
+        self.synthesize = synthesize  # callable(page_no, text) -> mp3 path
+        self.log = log
+        self.pool = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self.pending = deque()
+        self.ahead = None  # future for the next page's mp3
+        self.active = False
+        self._after_id = None  # pending root.after callback, if any
+
+    def start(self, pages):
+        """pages: list of (page_no, text) to play in order."""
+        if not pages:
+            return
+        self.stop()
+        self.pending = deque(pages)
+        self.active = True
+        self.ahead = self.pool.submit(self.synthesize, *self.pending.popleft())
+        if self.log: self.log(f"Play All: {len(pages)} page(s) queued")
+        self._poll()
+
+    def stop(self):
+        # cancel the scheduled poll too, or a restart while playing
+        # would leave two concurrent poll chains double-advancing
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        if self.active:
+            self.active = False
+            self.pending.clear()
+            self.ahead = None
+            self.player.stop()
+
+    def _poll(self):
+        # Tk has no pygame event pump, so poll the mixer instead of
+        # relying on set_endevent (which needs a pygame event loop).
+        self._after_id = None
+        if not self.active:
+            return
+        if not self.player.is_busy() and not self.player.paused:
+            if self.ahead is None:
+                self.active = False
+                if self.log: self.log("Play All: finished")
+                return
+            if self.ahead.done():
+                self._advance()
+        self._after_id = self.root.after(200, self._poll)
+
+    def _advance(self):
+        try:
+            path = self.ahead.result()
+        except Exception as e:
+            if self.log: self.log(f"Play All: synth error: {e}")
+            path = None
+        # immediately prefetch the next page before starting playback
+        self.ahead = (self.pool.submit(self.synthesize, *self.pending.popleft())
+                      if self.pending else None)
+        if path:
+            self.player.play(path)
+
+# ---------- GUI ----------
+class PDFToAudiobookApp:
+    def __init__(self, root):
+        self.root = root
+        root.title("PDF → Audiobook")
+        root.geometry("820x600")
+        self.pdf_path = None
+        self.pdf_hash = None  # md5 of the loaded PDF bytes, for cache keys
+        self.extracted = []  # list of (page_no, text, preview)
+        self.tempdir = tempfile.mkdtemp(prefix="pdf_audiobook_")
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        self.cache_index = self._load_cache_index()
+        self.config = self._load_config()
+        # worker threads never touch Tk widgets directly: log() only
+        # enqueues, and the main loop drains the queue via after()
+        self._log_q = queue.Queue()
+        root.after(50, self._pump_log)
+        self.player = Player(log=self.log)
+        self.playlist = PlaylistPlayer(root, self.player, self._synthesize_page, log=self.log)
+        self.tts_manager = TTSManager('pyttsx3')  # default
+        self.setup_ui()
+
+    def setup_ui(self):
+        frm = ttk.Frame(self.root, padding=8)
+        frm.pack(fill='both', expand=True)
+
+        # Top controls
+        top = ttk.Frame(frm)
+        top.pack(fill='x', pady=4)
+
+        ttk.Button(top, text="Load PDF", command=self.load_pdf).pack(side='left')
+        ttk.Button(top, text="Create Sample PDF", command=self.create_sample_pdf).pack(side='left', padx=6)
+
+        ttk.Label(top, text="TTS Engine:").pack(side='left', padx=(10,2))
+        self.engine_var = tk.StringVar(value='pyttsx3')
+        engine_menu = ttk.Combobox(top, textvariable=self.engine_var, values=['pyttsx3', 'gTTS', 'piper'], width=8)
+        engine_menu.pack(side='left')
+        engine_menu.bind("<<ComboboxSelected>>", lambda e: self.change_engine())
+
+        ttk.Label(top, text="Rate:").pack(side='left', padx=(10,2))
+        self.rate_var = tk.IntVar(value=160)
+        ttk.Spinbox(top, from_=80, to=300, textvariable=self.rate_var, width=6).pack(side='left')
+
+        ttk.Label(top, text="Chunk size (chars):").pack(side='left', padx=(10,2))
+        self.chunk_var = tk.IntVar(value=3500)
+        ttk.Spinbox(top, from_=1000, to=15000, increment=500, textvariable=self.chunk_var, width=7).pack(side='left')
+
+        ttk.Label(top, text="Parallel TTS:").pack(side='left', padx=(10,2))
+        self.workers_var = tk.IntVar(value=4)
+        ttk.Spinbox(top, from_=1, to=16, textvariable=self.workers_var, width=4).pack(side='left')
+
+        # Page range options
+        range_frame = ttk.Frame(frm)
+        range_frame.pack(fill='x', pady=6)
+        ttk.Label(range_frame, text="Pages (start-end, leave blank = all):").pack(side='left')
+        self.pages_entry = ttk.Entry(range_frame, width=20)
+        self.pages_entry.pack(side='left', padx=6)
+        self.force_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(range_frame, text="Force refresh (ignore cache)",
+                        variable=self.force_var).pack(side='left', padx=10)
+
+        # Main area: left list of pages, right controls + log
+        main = ttk.Panedwindow(frm, orient='horizontal')
+        main.pack(fill='both', expand=True)
+
+        left = ttk.Frame(main, width=280)
+        main.add(left, weight=1)
+        right = ttk.Frame(main)
+        main.add(right, weight=3)
+
+        ttk.Label(left, text="Extracted pages").pack(anchor='w')
+        self.pages_list = tk.Listbox(left, height=20)
+        self.pages_list.pack(fill='both', expand=True, padx=4, pady=4)
+
+        # Right controls
+        controls = ttk.Frame(right)
+        controls.pack(fill='x', pady=4)
+        ttk.Button(controls, text="Extract Text", command=self.extract_clicked).pack(side='left')
+        ttk.Button(controls, text="Convert -> MP3", command=self.convert_clicked).pack(side='left', padx=6)
+        ttk.Button(controls, text="Play Selected MP3", command=self.play_selected_mp3).pack(side='left', padx=6)
+        ttk.Button(controls, text="Speak Page", command=self.speak_page_clicked).pack(side='left', padx=6)
+        ttk.Button(controls, text="Play All", command=self.play_all_clicked).pack(side='left', padx=6)
+        ttk.Button(controls, text="Stop", command=self.stop_clicked).pack(side='left', padx=6)
+        ttk.Button(controls, text="Pause/Resume", command=lambda: self.player.pause()).pack(side='left', padx=6)
+
+        # Log / details
+        ttk.Label(right, text="Log / Output").pack(anchor='w')
+        self.log_text = tk.Text(right, height=20)
+        self.log_text.pack(fill='both', expand=True, padx=4, pady=4)
+
+        # Status bar
+        self.status_var = tk.StringVar(value="Ready")
+        ttk.Label(self.root, textvariable=self.status_var, relief='sunken', anchor='w').pack(side='bottom', fill='x')
+
+    def _load_cache_index(self):
+        index_path = os.path.join(CACHE_DIR, "index.json")
+        try:
+            with open(index_path) as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def _save_cache_index(self):
+        index_path = os.path.join(CACHE_DIR, "index.json")
+        try:
+            with open(index_path, 'w') as f:
+                json.dump(self.cache_index, f)
+        except Exception:
+            pass  # cache is best-effort
+
+    def _load_config(self):
+        try:
+            with open(CONFIG_PATH) as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def _save_config(self):
+        try:
+            with open(CONFIG_PATH, 'w') as f:
+                json.dump(self.config, f)
+        except Exception:
+            pass  # config is best-effort
+
+    def _page_cache_key(self, page_no, engine, rate):
+        voice = hashlib.md5(self.tts_manager.current_voice_id().encode()).hexdigest()[:8]
+        return f"{self.pdf_hash}_{page_no}_{engine}_{rate}_{voice}"
+
+    def _cache_page(self, page_no, out_path, cache_path):
+        if not cache_path:
+            return
+        try:
+            shutil.copy(out_path, cache_path)
+            self.cache_index[os.path.basename(cache_path)] = {
+                'pdf': self.pdf_path, 'page': page_no, 'created': time.time()}
+        except Exception:
+            pass  # cache is best-effort
+
+    def log(self, msg):
+        # safe to call from any thread
+        self._log_q.put((time.strftime("%H:%M:%S"), msg))
+
+    def _pump_log(self):
+        # drain up to 100 messages per tick into one insert so heavy
+        # per-chunk logging doesn't force a widget redraw per message
+        lines = []
+        last_msg = None
+        for _ in range(100):
+            try:
+                ts, msg = self._log_q.get_nowait()
+            except queue.Empty:
+                break
+            lines.append(f"[{ts}] {msg}\n")
+            last_msg = msg
+        if lines:
+            self.log_text.insert('end', ''.join(lines))
+            self.log_text.see('end')
+            self.status_var.set(last_msg)
+        self.root.after(50, self._pump_log)
+
+    def change_engine(self):
+        eng = self.engine_var.get()
+        # engines are cached in TTSManager; just repoint the manager
+        self.tts_manager.engine_name = eng
+        self.log(f"Switched TTS engine -> {eng}")
+        # update rate/voice options if pyttsx3
+        if eng == 'pyttsx3':
+            voices = self.tts_manager.get_voice_names()
+            self.log(f"Available voices: {voices[:5]}{'...' if len(voices)>5 else ''}")
+
+    def load_pdf(self):
+        path = filedialog.askopenfilename(title="Select PDF", filetypes=[("PDF files","*.pdf")])
+        if not path:
+            return
+        self.pdf_path = path
+        self.pdf_hash = file_md5(path)
+        # drop any pages extracted from the previous PDF: converting them
+        # now would cache the old audio under the new PDF's hash
+        self.extracted = []
+        self.pages_list.delete(0, 'end')
+        self.log(f"Selected PDF: {path}")
+        self.root.title(f"PDF → Audiobook — {os.path.basename(path)}")
+
+    def create_sample_pdf(self):
+        # create a simple 3-page sample PDF using fitz
+        sample_path = os.path.join(self.tempdir, "sample.pdf")
+        doc = fitz.open()
+        for i in range(1,4):
+            page = doc.new_page()
+            text = f"Sample PDF page {i}\n\nThis is a sample page to demo PDF to audiobook conversion.\n" * 6
+            page.insert_text((72, 72), text, fontsize=12)
+        doc.save(sample_path)
+        doc.close()
+        messagebox.showinfo("Sample PDF created", f"Sample PDF saved to:\n{sample_path}")
+        self.log(f"Sample PDF created: {sample_path}")
+
+    def extract_clicked(self):
+        if not self.pdf_path:
+            messagebox.showwarning("No PDF", "Please load a PDF first.")
+            return
+        # parse page range
+        pr = self.pages_entry.get().strip()
+        start_page = None
+        end_page = None
+        if pr:
+            try:
+                parts = pr.split('-')
+                if len(parts) == 2:
+                    start_page = int(parts[0]) - 1
+                    end_page = int(parts[1]) - 1
+                else:
+                    start_page = int(parts[0]) - 1
+                    end_page = start_page
+            except Exception as e:
+                messagebox.showerror("Invalid range", "Enter pages like '1-5' or '3'")
+                return
+        # extract in background thread
+        def job():
+            try:
+                self.pages_list.delete(0, 'end')
+                # extraction cache: same PDF bytes + range -> reuse pickled pages
+                # pages2: entries are (page_no, text, preview) since the
+                # preview moved into the extractor
+                pages_cache = os.path.join(CACHE_DIR, f"{self.pdf_hash}_pages2_{start_page}_{end_page}.pkl")
+                if os.path.isfile(pages_cache) and not self.force_var.get():
+                    with open(pages_cache, 'rb') as f:
+                        self.extracted = pickle.load(f)
+                    self.log(f"Loaded {len(self.extracted)} page(s) from cache")
+                else:
+                    self.extracted = extract_text_from_pdf(self.pdf_path, start_page, end_page, log=self.log)
+                    try:
+                        with open(pages_cache, 'wb') as f:
+                            pickle.dump(self.extracted, f)
+                    except Exception:
+                        pass  # cache is best-effort
+                for p, _text, preview in self.extracted:
+                    self.pages_list.insert('end', f"Page {p}: {preview}...")
+                self.log(f"Extraction complete — {len(self.extracted)} pages")
+            except Exception as e:
+                self.log(f"Extraction error: {e}")
+        threading.Thread(target=job, daemon=True).start()
+
+    def convert_clicked(self):
+        if not self.extracted:
+            messagebox.showwarning("No text", "No extracted text. Click 'Extract Text' first.")
+            return
+        engine = self.engine_var.get()
+        rate = self.rate_var.get()
+        chunk_size = self.chunk_var.get()
+
+        # choose output path, starting from the last folder used
+        outdir = filedialog.askdirectory(title="Choose folder to save MP3(s)",
+                                         initialdir=self.config.get('last_outdir') or os.path.expanduser('~'))
+        if not outdir:
+            return
+        self.config['last_outdir'] = outdir
+        self._save_config()
+
+        # precompute zero-padded output paths so page_02 sorts before
+        # page_10 and no string formatting happens in the hot loop
+        width = len(str(max(p for p, _text, _preview in self.extracted)))
+        out_paths = {p: os.path.join(outdir, f"page_{p:0{width}d}.mp3")
+                     for p, _text, _preview in self.extracted}
+
+        # gTTS is network-bound and benefits from overlapping requests;
+        # pyttsx3 runs as one batched queue on the job thread instead.
+        max_workers = max(1, self.workers_var.get())
+
+        def job():
+            try:
+                self._convert_job(engine, rate, chunk_size, out_paths, max_workers, outdir)
+            except Exception as e:
+                # without this, a failure before the per-page handlers
+                # (engine init, cache copy) would kill the thread silently
+                self.log(f"Conversion error: {e}")
+
+        threading.Thread(target=job, daemon=True).start()
+
+    def _convert_job(self, engine, rate, chunk_size, out_paths, max_workers, outdir):
+        self.log("Starting conversion...")
+        if engine == 'pyttsx3':
+            # configure manager
+            self.tts_manager.set_rate(rate)
+            # volume handled by engine if desired; leave default
+        # For each page create one MP3 (or chunk them as desired)
+        pyttsx3_items = []  # (text, out_path) drained by one runAndWait
+        pyttsx3_meta = []   # (page_no, out_path, cache_path)
+        chunked_pages = []  # (page_no, out_path, cache_path, part_paths, part_futs)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {}
+            for page_no, text, _preview in self.extracted:
+                try:
+                    out_path = out_paths[page_no]
+                    # cache hit: copy the previously synthesized mp3 instead
+                    cache_key = self._page_cache_key(page_no, engine, rate)
+                    cache_path = os.path.join(CACHE_DIR, f"{cache_key}.mp3")
+                    if os.path.isfile(cache_path) and not self.force_var.get():
+                        shutil.copy(cache_path, out_path)
+                        self.log(f"Page {page_no}: cache hit -> {out_path}")
+                        continue
+                    if engine == 'pyttsx3':
+                        # pyttsx3 saves one file per call, so consume the
+                        # chunk generator straight into the joined text
+                        full_text = (text if len(text) <= chunk_size
+                                     else "\n\n".join(_iter_chunks(text, chunk_size)))
+                        self.log(f"Queued page {page_no} via pyttsx3 -> {out_path}")
+                        pyttsx3_items.append((full_text, out_path))
+                        pyttsx3_meta.append((page_no, out_path, cache_path))
+                    elif engine == 'piper':
+                        # one native process per page, fanned out across
+                        # the executor — piper has no request size limit,
+                        # so pages go through whole
+                        self.log(f"Queued page {page_no} via piper -> {out_path}")
+                        fut = executor.submit(self.tts_manager.save_text_to_mp3_piper,
+                                              text, out_path, log=self.log)
+                        futures[fut] = (page_no, out_path, cache_path)
+                    elif len(text) <= chunk_size:
+                        self.log(f"Queued page {page_no} via gTTS -> {out_path}")
+                        fut = executor.submit(self.tts_manager.save_text_to_mp3_gtts,
+                                              text, out_path, log=self.log)
+                        futures[fut] = (page_no, out_path, cache_path)
+                    else:
+                        # gTTS: stream chunks off the generator into the
+                        # executor as they are packed; parts synthesize
+                        # concurrently, then concat into one mp3 per page
+                        part_futs = []
+                        part_paths = []
+                        for j, chunk in enumerate(_iter_chunks(text, chunk_size), 1):
+                            part_path = os.path.join(self.tempdir, f"page_{page_no}_part{j}.mp3")
+                            part_futs.append(executor.submit(self.tts_manager.save_text_to_mp3_gtts,
+                                                             chunk, part_path, log=self.log))
+                            part_paths.append(part_path)
+                        self.log(f"Queued page {page_no} via gTTS ({len(part_paths)} chunks) -> {out_path}")
+                        chunked_pages.append((page_no, out_path, cache_path, part_paths, part_futs))
+                except Exception as e:
+                    self.log(f"Error saving page {page_no}: {e}")
+            if pyttsx3_items:
+                # single runAndWait for the whole document: one driver
+                # warm-up instead of one per page
+                try:
+                    self.tts_manager.save_many_pyttsx3(pyttsx3_items, log=self.log)
+                    for page_no, out_path, cache_path in pyttsx3_meta:
+                        self.log(f"Page {page_no} exported: {out_path}")
+                        self._cache_page(page_no, out_path, cache_path)
+                except Exception as e:
+                    self.log(f"pyttsx3 batch error: {e}")
+            for fut in concurrent.futures.as_completed(futures):
+                page_no, out_path, cache_path = futures[fut]
+                try:
+                    fut.result()
+                    self.log(f"Page {page_no} exported: {out_path}")
+                    self._cache_page(page_no, out_path, cache_path)
+                except Exception as e:
+                    self.log(f"Error saving page {page_no}: {e}")
+            # stitch chunked gTTS pages back into one mp3 per page,
+            # in submission order so audio order matches the text
+            for page_no, out_path, cache_path, part_paths, part_futs in chunked_pages:
+                try:
+                    for pf in part_futs:
+                        pf.result()
+                    concat_mp3(part_paths, out_path)
+                    self.log(f"Page {page_no} exported: {out_path}")
+                    self._cache_page(page_no, out_path, cache_path)
+                except Exception as e:
+                    self.log(f"Error saving page {page_no}: {e}")
+                finally:
+                    for part in part_paths:
+                        try:
+                            os.remove(part)
+                        except OSError:
+                            pass
+            self._save_cache_index()
+        self.log("Conversion finished.")
+        messagebox.showinfo("Done", f"Exported MP3 files to:\n{outdir}")
+
+    def _synthesize_page(self, page_no, text):
+        """Synthesize one page into the temp dir and return the mp3 path.
+        Runs on the PlaylistPlayer worker thread."""
+        out_path = os.path.join(self.tempdir, f"playall_page_{page_no}.mp3")
+        engine = self.engine_var.get()
+        if engine == 'pyttsx3':
+            self.tts_manager.set_rate(self.rate_var.get())
+            self.tts_manager.save_text_to_mp3_pyttsx3(text, out_path, log=self.log)
+        elif engine == 'piper':
+            self.tts_manager.save_text_to_mp3_piper(text, out_path, log=self.log)
+        else:
+            self.tts_manager.save_text_to_mp3_gtts(text, out_path, log=self.log)
+        return out_path
+
+    def speak_page_clicked(self):
+        """Speak the page selected in the list without exporting a file."""
+        sel = self.pages_list.curselection()
+        if not sel or not self.extracted:
+            messagebox.showwarning("No page", "Select an extracted page first.")
+            return
+        page_no, text, _preview = self.extracted[sel[0]]
+
+        def job():
+            try:
+                if self.engine_var.get() == 'gTTS':
+                    # stream into memory: playback starts without waiting
+                    # for a full mp3 to hit the disk
+                    buf = self.tts_manager.synth_gtts_stream(text, log=self.log)
+                    self.player.play_fileobj(buf, name=f"page {page_no}")
+                else:
+                    self.player.play(self._synthesize_page(page_no, text))
+            except Exception as e:
+                self.log(f"Speak page {page_no} error: {e}")
+        threading.Thread(target=job, daemon=True).start()
+
+    def play_all_clicked(self):
+        if not self.extracted:
+            messagebox.showwarning("No text", "No extracted text. Click 'Extract Text' first.")
+            return
+        self.playlist.start([(p, text) for p, text, _preview in self.extracted])
+
+    def stop_clicked(self):
+        self.playlist.stop()
+        self.player.stop()
+
+    def play_selected_mp3(self):
+        path = filedialog.askopenfilename(title="Select MP3 to play", filetypes=[("MP3 files","*.mp3")])
+        if not path:
+            return
+        self.player.play(path)
+
+# ---------- Run ----------
+def main():
+    root = tk.Tk()
+    app = PDFToAudiobookApp(root)
+    root.mainloop()
+
+if __name__ == '__main__':
+    main()